@@ -1,28 +1,76 @@
 from __future__ import annotations
 
 import csv
+import gzip
+import itertools
+import os
+import re
 import shutil
 import textwrap
+import threading
 import time
 import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Optional, Tuple, List
+from typing import Callable, Dict, Optional, Set, Tuple, List
 
-from .models import RepoInfo, ArchiveOptions, RunPaths, AuthConfig
+from .models import RepoInfo, ArchiveOptions, RunPaths, AuthConfig, ZipMode, ZipCompression
 from .utils import (
-    append_log,
+    LogWriter,
     ensure_dir,
     file_size_bytes,
     now_str,
+    remove_tree,
     safe_filename,
     ts_compact,
     write_text,
-    b64_basic,
-    b64_basic_pat,
 )
 from .tfs_api import list_repos
-from .git_ops import run_git, CancelledError
+from .git_ops import run_git, run_git_to_stream, CancelledError
+
+try:  # optional faster DEFLATE backend: pip install zlib-ng
+    from zlib_ng import zlib_ng as _fast_zlib
+except ImportError:
+    _fast_zlib = None
+else:
+    # zipfile resolves zlib as a module global; zlib_ng is a drop-in replacement
+    zipfile.zlib = _fast_zlib
+
+
+# Lower bound for auto-selected parallelism (ArchiveOptions.parallelism == 0):
+# clone/fetch is mostly network wait, so even small machines run a few repos at once
+MIN_AUTO_WORKERS = 4
+
+# Transfer tuning for clone: auto pack threads, fast zlib for locally written objects
+GIT_CLONE_CONFIG = [
+    "-c", "pack.threads=0",
+    "-c", "core.compression=1",
+    "-c", "fetch.negotiationAlgorithm=skipping",
+]
+
+# Delta search memory cap per pack thread for git bundle create
+BUNDLE_PACK_WINDOW_MEMORY = "256m"
+
+# CSV report: write buffer and how many rows may sit in it before a flush
+CSV_BUFFER_SIZE = 1 << 16
+CSV_FLUSH_EVERY = 32
+
+# csv.writer defaults (dialect "excel") reproduced by _csv_row
+_CSV_DELIM = ";"
+_CSV_EOL = "\r\n"
+_CSV_SPECIAL = frozenset(';"\r\n')
+
+# Read/write chunk for copying bundles into ZIP
+COPY_BUFFER_SIZE = 1 << 20
+
+_ZIP_COMPRESS_TYPES = {
+    ZipCompression.STORE: zipfile.ZIP_STORED,
+    ZipCompression.DEFLATE: zipfile.ZIP_DEFLATED,
+}
+if hasattr(zipfile, "ZIP_ZSTANDARD"):  # Python 3.14+
+    _ZIP_COMPRESS_TYPES[ZipCompression.ZSTD] = zipfile.ZIP_ZSTANDARD
 
 
 def make_readme(out_root: Path) -> str:
@@ -33,30 +81,50 @@ def make_readme(out_root: Path) -> str:
     Folder:  {out_root}
 
     ## Contents
-    - bundles/   : *.bundle OR *.zip (if zip enabled)
+    - bundles/   : *.bundle + restore readmes, *.zip (zip mode) OR *.bundle.gz (gz mode)
     - logs/      : run logs
     - reports/   : CSV report
 
     ## Notes
     - Bundle includes all refs (--all): branches/tags should be present.
     - If your server uses LFS, LFS objects are not embedded into bundle automatically.
+    - *.bundle.gz must be unpacked before restore: gzip -d <repo>.bundle.gz
     """)
 
 
-def make_restore_ru(repo_name: str, branch_hint: str = "master") -> str:
+def _restore_files(repo_name: str, zip_mode: ZipMode) -> List[str]:
+    # what the readme sits next to (or inside, for ZIP)
+    if zip_mode == ZipMode.ZIP:
+        return [f"{repo_name}.bundle", "README_RESTORE_RU.txt", "README_RESTORE_EN.txt"]
+    artifact = f"{repo_name}.bundle.gz" if zip_mode == ZipMode.GZ else f"{repo_name}.bundle"
+    return [artifact, f"{repo_name}_README_RESTORE_RU.txt", f"{repo_name}_README_RESTORE_EN.txt"]
+
+
+def make_restore_ru(repo_name: str, branch_hint: str = "master", zip_mode: ZipMode = ZipMode.ZIP) -> str:
+    files = "\n".join(f"  - {f}" for f in _restore_files(repo_name, zip_mode))
+    where = "В архиве находятся" if zip_mode == ZipMode.ZIP else "Файлы"
+    unpack = ""
+    created = f"git bundle create {repo_name}.bundle --all"
+    if zip_mode == ZipMode.GZ:
+        unpack = f"""\
+Сначала распакуйте bundle (получится {repo_name}.bundle):
+
+  gzip -d {repo_name}.bundle.gz
+  (Windows без gzip: 7-Zip -> "Извлечь")
+
+"""
+        created = f"git bundle create - --all | gzip  ->  {repo_name}.bundle.gz"
     return f"""\
 АРХИВ РЕПОЗИТОРИЯ: {repo_name}
 
-В архиве находятся:
-  - {repo_name}.bundle
-  - README_RESTORE_RU.txt
-  - README_RESTORE_EN.txt
+{where}:
+{files}
 
 ============================================================
 КАК ВОССТАНОВИТЬ РЕПОЗИТОРИЙ ИЗ BUNDLE
 ============================================================
 
-Вариант A (проще всего):
+{unpack}Вариант A (проще всего):
 
   git clone {repo_name}.bundle {repo_name}
   cd {repo_name}
@@ -72,27 +140,38 @@ def make_restore_ru(repo_name: str, branch_hint: str = "master") -> str:
   git checkout {branch_hint}
 
 Примечания:
-- Bundle создаётся так: git bundle create {repo_name}.bundle --all
+- Bundle создаётся так: {created}
 - Проверка:           git bundle verify {repo_name}.bundle
 
 Дата: {now_str()}
 """
 
 
-def make_restore_en(repo_name: str, branch_hint: str = "master") -> str:
+def make_restore_en(repo_name: str, branch_hint: str = "master", zip_mode: ZipMode = ZipMode.ZIP) -> str:
+    files = "\n".join(f"  - {f}" for f in _restore_files(repo_name, zip_mode))
+    where = "Inside" if zip_mode == ZipMode.ZIP else "Files"
+    unpack = ""
+    created = f"git bundle create {repo_name}.bundle --all"
+    if zip_mode == ZipMode.GZ:
+        unpack = f"""\
+First unpack the bundle (gives {repo_name}.bundle):
+
+  gzip -d {repo_name}.bundle.gz
+  (Windows without gzip: 7-Zip -> "Extract")
+
+"""
+        created = f"git bundle create - --all | gzip  ->  {repo_name}.bundle.gz"
     return f"""\
 REPOSITORY ARCHIVE: {repo_name}
 
-Inside:
-  - {repo_name}.bundle
-  - README_RESTORE_RU.txt
-  - README_RESTORE_EN.txt
+{where}:
+{files}
 
 ============================================================
 HOW TO RESTORE FROM BUNDLE
 ============================================================
 
-Option A (simple):
+{unpack}Option A (simple):
 
   git clone {repo_name}.bundle {repo_name}
   cd {repo_name}
@@ -108,26 +187,106 @@ Option B (manual):
   git checkout {branch_hint}
 
 Notes:
-- Bundle was created with: git bundle create {repo_name}.bundle --all
-- Integrity check used:   git bundle verify {repo_name}.bundle
+- Bundle was created with: {created}
+- Integrity check:       git bundle verify {repo_name}.bundle
 
 Date: {now_str()}
 """
 
 
-def pack_bundle_to_zip(repo_name_safe: str, bundle_path: Path, log_path: Path) -> Path:
-    zip_name = f"{repo_name_safe}_{ts_compact()}.zip"
-    zip_path = bundle_path.parent / zip_name
-
-    append_log(log_path, f"[{repo_name_safe}] Creating ZIP: {zip_path}")
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.write(bundle_path, arcname=bundle_path.name)
-        zf.writestr("README_RESTORE_RU.txt", make_restore_ru(repo_name_safe))
-        zf.writestr("README_RESTORE_EN.txt", make_restore_en(repo_name_safe))
+def pack_bundle_to_zip(
+    repo_name_safe: str,
+    bundle_path: Path,
+    run_id: str,
+    logger: LogWriter,
+    compression: ZipCompression = ZipCompression.STORE,
+    zip_dir: Optional[Path] = None,
+) -> Path:
+    zip_name = f"{repo_name_safe}_{run_id}.zip"
+    zip_path = (zip_dir or bundle_path.parent) / zip_name
+
+    logger.write(f"[{repo_name_safe}] Creating ZIP: {zip_path}")
+    # Bundle pack data is already zlib-compressed: by default store it as is, deflate only the readmes
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        info = zipfile.ZipInfo.from_file(bundle_path, arcname=bundle_path.name)
+        info.compress_type = _ZIP_COMPRESS_TYPES[compression]
+        # force_zip64: bundles of big repos easily exceed 4 GiB
+        with open(bundle_path, "rb", buffering=COPY_BUFFER_SIZE) as src, zf.open(info, mode="w", force_zip64=True) as dst:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(src.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            shutil.copyfileobj(src, dst, length=COPY_BUFFER_SIZE)
+            # bundle is read once and usually deleted next: do not keep it in the page cache
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(src.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        zf.writestr("README_RESTORE_RU.txt", make_restore_ru(repo_name_safe), compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
+        zf.writestr("README_RESTORE_EN.txt", make_restore_en(repo_name_safe), compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
 
     return zip_path
 
 
+def _csv_field(v: object) -> str:
+    s = str(v)
+    if _CSV_SPECIAL.isdisjoint(s):
+        return s
+    return '"' + s.replace('"', '""') + '"'
+
+
+def _csv_row(*fields: object) -> str:
+    """One report line, same output as csv.writer(delimiter=";") with minimal quoting."""
+    return _CSV_DELIM.join(map(_csv_field, fields)) + _CSV_EOL
+
+
+def write_restore_readmes(out_dir: Path, repo_name_safe: str, zip_mode: ZipMode) -> None:
+    write_text(out_dir / f"{repo_name_safe}_README_RESTORE_RU.txt", make_restore_ru(repo_name_safe, zip_mode=zip_mode))
+    write_text(out_dir / f"{repo_name_safe}_README_RESTORE_EN.txt", make_restore_en(repo_name_safe, zip_mode=zip_mode))
+
+
+def index_existing_zips(bundles_dir: Path) -> Dict[str, List[Path]]:
+    """Map repo_safe -> its ZIPs (oldest first), from one scan of bundles_dir."""
+    index: Dict[str, List[Path]] = {}
+    for p in bundles_dir.iterdir():
+        if p.suffix != ".zip":
+            continue
+        # <repo_safe>_<YYYYmmdd>_<HHMMSS>.zip
+        parts = p.stem.rsplit("_", 2)
+        if len(parts) == 3:
+            index.setdefault(parts[0], []).append(p)
+    for zips in index.values():
+        zips.sort()
+    return index
+
+
+def auto_workers() -> int:
+    """Default worker count: ~3/4 of the CPUs, at least MIN_AUTO_WORKERS."""
+    return max(MIN_AUTO_WORKERS, (os.cpu_count() or 1) * 3 // 4)
+
+
+def repo_file_names(repos: List[RepoInfo]) -> Dict[RepoInfo, str]:
+    """
+    File name (mirror/bundle/zip stem) per repo: safe_filename(name), plus
+    _<digest> only for names that collide after sanitizing, so existing
+    artifacts of unambiguous repos keep their names.
+    """
+    names = [safe_filename(r.name) for r in repos]
+    counts = Counter(names)
+    return {r: f"{n}_{r.digest}" if counts[n] > 1 else n for r, n in zip(repos, names)}
+
+
+def compile_only_filter(only: str) -> Optional[Callable[[str], bool]]:
+    """
+    Repo name matcher for --only: comma-separated substrings, case-insensitive.
+    Several patterns become one regex alternation (a single C-level scan per name).
+    """
+    patterns = sorted({p.strip().casefold() for p in only.split(",")} - {""})
+    if not patterns:
+        return None
+    if len(patterns) == 1:
+        needle = patterns[0]
+        return lambda name: needle in name.casefold()
+    search = re.compile("|".join(map(re.escape, patterns))).search
+    return lambda name: search(name.casefold()) is not None
+
+
 def build_run_paths(opts: ArchiveOptions, run_id: str) -> RunPaths:
     out_root = opts.out_root.expanduser().resolve()
 
@@ -135,6 +294,15 @@ def build_run_paths(opts: ArchiveOptions, run_id: str) -> RunPaths:
     mirrors_dir = out_root / "mirrors"
     logs_dir = out_root / "logs"
     reports_dir = out_root / "reports"
+    stage_dir = bundles_dir
+
+    # intermediate data (mirrors, bundles deleted after ZIP) on scratch storage,
+    # only final artifacts, logs and reports under out_root
+    if opts.scratch_dir:
+        scratch_dir = opts.scratch_dir.expanduser().resolve()
+        mirrors_dir = scratch_dir / "mirrors"
+        stage_dir = scratch_dir / "bundles"
+        ensure_dir(stage_dir)
 
     ensure_dir(bundles_dir)
     ensure_dir(mirrors_dir)
@@ -154,111 +322,196 @@ def build_run_paths(opts: ArchiveOptions, run_id: str) -> RunPaths:
         log_path=log_path,
         csv_path=csv_path,
         readme_path=readme_path,
+        stage_dir=stage_dir,
     )
 
 
-def auth_to_basic_b64(auth: AuthConfig) -> str:
-    auth.validate()
-    if auth.mode.value == "pat":
-        return b64_basic_pat(auth.pat or "")
-    return b64_basic(auth.username or "", auth.password or "")
-
-
 def archive_one_repo(
     repo: RepoInfo,
+    repo_safe: str,
     paths: RunPaths,
-    log_path: Path,
-    auth_basic_b64: str,
+    run_id: str,
+    logger: LogWriter,
+    auth_header: str,
     *,
     keep_mirrors: bool,
-    zip_enabled: bool,
+    zip_mode: ZipMode,
     delete_bundle_after_zip: bool,
     skip_existing: bool,
+    verify_bundles: bool = False,
+    clone_filter: Optional[str] = None,
+    zip_compression: ZipCompression = ZipCompression.STORE,
+    existing_zips: Optional[Dict[str, List[Path]]] = None,
+    existing_files: Optional[Set[str]] = None,
+    pack_threads: int = 0,
+    mirror_root: Optional[Path] = None,
     is_cancelled: Optional[Callable[[], bool]] = None,
     current_proc_setter=None,
     on_progress: Optional[Callable[[str], None]] = None,
 ) -> Tuple[bool, str, Optional[Path]]:
-    repo_safe = safe_filename(repo.name)
-    mirror_path = paths.mirrors_dir / f"{repo_safe}.git"
-    bundle_path = paths.bundles_dir / f"{repo_safe}.bundle"
-
-    if zip_enabled and skip_existing:
-        existing = sorted(paths.bundles_dir.glob(f"{repo_safe}_*.zip"))
+    mirror_path = (mirror_root or paths.mirrors_dir) / f"{repo_safe}.git"
+    # the bundle is only an intermediate when it is zipped and deleted
+    staged = zip_mode == ZipMode.ZIP and delete_bundle_after_zip
+    bundle_path = (paths.stage_dir if staged else paths.bundles_dir) / f"{repo_safe}.bundle"
+    mirror_str = os.fspath(mirror_path)
+    bundle_str = os.fspath(bundle_path)
+    gz_path = paths.bundles_dir / f"{repo_safe}.bundle.gz"
+
+    if zip_mode == ZipMode.ZIP and skip_existing:
+        if existing_zips is None:
+            existing_zips = index_existing_zips(paths.bundles_dir)
+        existing = existing_zips.get(repo_safe)
         if existing:
-            append_log(log_path, f"[{repo.name}] SKIP: ZIP already exists: {existing[-1].name}")
+            logger.write(f"[{repo.name}] SKIP: ZIP already exists: {existing[-1].name}")
             return True, "SKIPPED (zip exists)", existing[-1]
 
-    if (not zip_enabled) and skip_existing and bundle_path.exists():
-        append_log(log_path, f"[{repo.name}] SKIP: bundle already exists: {bundle_path.name}")
-        return True, "SKIPPED (bundle exists)", bundle_path
+    def exists_in_bundles(p: Path) -> bool:
+        return p.name in existing_files if existing_files is not None else p.exists()
 
-    extra_header = f"Authorization: Basic {auth_basic_b64}"
-
-    if mirror_path.exists():
-        append_log(log_path, f"[{repo.name}] Mirror already exists, removing: {mirror_path}")
-        shutil.rmtree(mirror_path, ignore_errors=True)
-
-    rc = run_git(
-        [
-            "git",
-            "-c",
-            f"http.extraHeader={extra_header}",
-            "-c",
-            "core.askPass=",
-            "clone",
-            "--mirror",
-            "--progress",
-            repo.remote_url,
-            str(mirror_path),
-        ],
-        cwd=None,
-        log_path=log_path,
-        is_cancelled=is_cancelled,
-        current_proc_setter=current_proc_setter,
-        on_output=on_progress,
-    )
-    if rc != 0:
-        return False, f"git clone --mirror failed (rc={rc})", None
+    if zip_mode == ZipMode.GZ and skip_existing and exists_in_bundles(gz_path):
+        logger.write(f"[{repo.name}] SKIP: gzipped bundle already exists: {gz_path.name}")
+        return True, "SKIPPED (bundle.gz exists)", gz_path
 
-    if bundle_path.exists():
-        bundle_path.unlink(missing_ok=True)
+    if zip_mode == ZipMode.NONE and skip_existing and exists_in_bundles(bundle_path):
+        logger.write(f"[{repo.name}] SKIP: bundle already exists: {bundle_path.name}")
+        return True, "SKIPPED (bundle exists)", bundle_path
 
-    rc = run_git(
-        ["git", "bundle", "create", str(bundle_path), "--all"],
-        cwd=mirror_path,
-        log_path=log_path,
-        is_cancelled=is_cancelled,
-        current_proc_setter=current_proc_setter,
-        on_output=on_progress,
-    )
-    if rc != 0:
-        return False, f"git bundle create failed (rc={rc})", None
+    # several repos run at once: tag git output with the repo it belongs to
+    on_output: Optional[Callable[[str], None]] = None
+    if on_progress:
+        def on_output(piece: str) -> None:
+            on_progress(f"[{repo.name}] {piece}")
+
+    auth_config = ["-c", f"http.extraHeader={auth_header}", "-c", "core.askPass="]
+
+    # bundle create must get the same filter, otherwise it lazily fetches the missing blobs
+    filter_args: List[str] = [f"--filter={clone_filter}"] if clone_filter else []
+    # pack-objects threads for bundle create (0 = git decides, one per CPU)
+    bundle_config = ["-c", f"pack.threads={pack_threads}", "-c", f"pack.windowMemory={BUNDLE_PACK_WINDOW_MEMORY}"]
+
+    rc = -1
+    if keep_mirrors and (mirror_path / "HEAD").exists():
+        # incremental: only new objects are transferred
+        logger.write(f"[{repo.name}] Updating existing mirror: {mirror_path}")
+        rc = run_git(
+            ["git", *auth_config, *GIT_CLONE_CONFIG, "fetch", "--prune", "--progress", "origin"],
+            cwd=mirror_str,
+            logger=logger,
+            is_cancelled=is_cancelled,
+            current_proc_setter=current_proc_setter,
+            on_output=on_output,
+        )
+        if rc != 0:
+            logger.write(f"[{repo.name}] Mirror update failed (rc={rc}), cloning from scratch")
 
-    rc = run_git(
-        ["git", "bundle", "verify", str(bundle_path)],
-        cwd=mirror_path,
-        log_path=log_path,
-        is_cancelled=is_cancelled,
-        current_proc_setter=current_proc_setter,
-        on_output=on_progress,
-    )
     if rc != 0:
-        return False, f"git bundle verify failed (rc={rc})", bundle_path
-
-    artifact_path: Path = bundle_path
+        # clone next to the mirror and swap it in only on success: a failed clone
+        # (expired PAT, network) or a cancel must not cost the existing mirror
+        partial_path = mirror_path.with_name(mirror_path.name + ".partial")
+        if partial_path.exists():
+            remove_tree(partial_path)
+
+        if clone_filter:
+            logger.write(
+                f"[{repo.name}] Partial clone --filter={clone_filter} "
+                "(needs uploadpack.allowFilter=true on the server, otherwise git falls back to a full clone)",
+            )
 
-    if zip_enabled:
-        zip_path = pack_bundle_to_zip(repo_safe, bundle_path, log_path)
-        artifact_path = zip_path
-        append_log(log_path, f"[{repo.name}] ZIP created: {zip_path}")
-
-        if delete_bundle_after_zip:
+        try:
+            rc = run_git(
+                ["git", *auth_config, *GIT_CLONE_CONFIG, "clone", "--mirror", "--progress", *filter_args, repo.remote_url, os.fspath(partial_path)],
+                cwd=None,
+                logger=logger,
+                is_cancelled=is_cancelled,
+                current_proc_setter=current_proc_setter,
+                on_output=on_output,
+            )
+        except BaseException:
+            remove_tree(partial_path)
+            raise
+        if rc != 0:
+            remove_tree(partial_path)
+            if mirror_path.exists():
+                logger.write(f"[{repo.name}] Clone failed, existing mirror kept: {mirror_path}")
+            return False, f"git clone --mirror failed (rc={rc})", None
+
+        if mirror_path.exists():
+            logger.write(f"[{repo.name}] Replacing mirror: {mirror_path}")
+            remove_tree(mirror_path)
+        partial_path.rename(mirror_path)
+
+    if zip_mode == ZipMode.GZ:
+        # bundle goes from git's stdout straight into gzip, never materialized on disk
+        logger.write(f"[{repo.name}] Creating gzipped bundle: {gz_path}")
+        try:
+            with gzip.GzipFile(gz_path, "wb", compresslevel=1) as gz:
+                rc = run_git_to_stream(
+                    ["git", *bundle_config, "bundle", "create", "-", "--all", *filter_args],
+                    cwd=mirror_str,
+                    logger=logger,
+                    sink=gz,
+                    is_cancelled=is_cancelled,
+                    current_proc_setter=current_proc_setter,
+                )
+        except BaseException:
+            gz_path.unlink(missing_ok=True)
+            raise
+        if rc != 0:
+            gz_path.unlink(missing_ok=True)
+            return False, f"git bundle create failed (rc={rc})", None
+
+        logger.write(f"[{repo.name}] Bundle verify skipped (gz mode)")
+        write_restore_readmes(paths.bundles_dir, repo_safe, zip_mode)
+        artifact_path: Path = gz_path
+
+    else:
+        if bundle_path.exists():
             bundle_path.unlink(missing_ok=True)
-            append_log(log_path, f"[{repo.name}] Deleted bundle after ZIP: {bundle_path.name}")
+
+        rc = run_git(
+            ["git", *bundle_config, "bundle", "create", bundle_str, "--all", *filter_args],
+            cwd=mirror_str,
+            logger=logger,
+            is_cancelled=is_cancelled,
+            current_proc_setter=current_proc_setter,
+            on_output=on_output,
+            capture_stdout=False,
+        )
+        if rc != 0:
+            return False, f"git bundle create failed (rc={rc})", None
+
+        # verify re-reads the whole bundle: opt-in
+        if verify_bundles:
+            rc = run_git(
+                ["git", "bundle", "verify", bundle_str],
+                cwd=mirror_str,
+                logger=logger,
+                is_cancelled=is_cancelled,
+                current_proc_setter=current_proc_setter,
+                on_output=on_output,
+                capture_stdout=False,
+            )
+            if rc != 0:
+                return False, f"git bundle verify failed (rc={rc})", bundle_path
+        else:
+            logger.write(f"[{repo.name}] Bundle verify skipped (verify_bundles=False)")
+
+        artifact_path = bundle_path
+
+        if zip_mode == ZipMode.ZIP:
+            zip_path = pack_bundle_to_zip(repo_safe, bundle_path, run_id, logger, zip_compression, zip_dir=paths.bundles_dir)
+            artifact_path = zip_path
+            logger.write(f"[{repo.name}] ZIP created: {zip_path}")
+
+            if delete_bundle_after_zip:
+                bundle_path.unlink(missing_ok=True)
+                logger.write(f"[{repo.name}] Deleted bundle after ZIP: {bundle_path.name}")
+        else:
+            write_restore_readmes(paths.bundles_dir, repo_safe, zip_mode)
 
     if not keep_mirrors:
-        append_log(log_path, f"[{repo.name}] Removing mirror: {mirror_path}")
-        shutil.rmtree(mirror_path, ignore_errors=True)
+        logger.write(f"[{repo.name}] Removing mirror: {mirror_path}")
+        remove_tree(mirror_path)
 
     return True, "OK", artifact_path
 
@@ -285,58 +538,125 @@ def run_archive(
 
     write_text(paths.readme_path, make_readme(paths.out_root))
 
-    auth_b64 = auth_to_basic_b64(auth)
-
-    def log(line: str) -> None:
-        append_log(paths.log_path, line)
-        if on_progress:
-            on_progress(line)
-
-    log("START")
-    log(f"CollectionUrl: {opts.collection_url}")
-    log(f"Project:       {opts.project}")
-    log(f"OutRoot:       {paths.out_root}")
-    log(f"BundlesDir:    {paths.bundles_dir}")
-    log(f"KeepMirrors:   {opts.keep_mirrors}")
-    log(f"ZipBundles:    {opts.zip_bundles}")
-    log(f"DelBundleZip:  {opts.delete_bundle_after_zip}")
-    log(f"SkipExisting:  {opts.skip_existing}")
-    log("Fetching repositories...")
-
-    repos = list_repos(opts.collection_url, opts.project, auth_b64, opts.api_version)
-    log(f"Found repos: {len(repos)}")
-
-    only = (opts.only_substring or "").strip().lower()
-    if only:
-        repos = [r for r in repos if only in r.name.lower()]
-        log(f"Filtered repos by only='{only}': {len(repos)}")
-
-    if opts.max_repos and opts.max_repos > 0:
-        repos = repos[: opts.max_repos]
-        log(f"Limited repos by max_repos={opts.max_repos}: {len(repos)}")
-
-    ok_count = 0
-    fail_count = 0
-
-    with paths.csv_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f, delimiter=";")
-        w.writerow(["repo_name", "repo_id", "remote_url", "artifact_path", "artifact_size_bytes", "status", "message"])
-
-        for i, repo in enumerate(repos, start=1):
+    with LogWriter(paths.log_path) as logger:
+        authorization = auth.auth_header
+        auth_header = f"Authorization: {authorization}"
+
+        # workers report progress concurrently: deliver one line at a time
+        progress_lock = threading.Lock()
+        user_progress = on_progress
+        if user_progress:
+            def on_progress(line: str) -> None:
+                with progress_lock:
+                    user_progress(line)
+
+        # set when the run is aborted from the draining thread (Ctrl+C, error):
+        # workers see it through is_cancelled and stop at the next check
+        stop = threading.Event()
+        user_cancelled = is_cancelled
+
+        def is_cancelled() -> bool:
+            return stop.is_set() or bool(user_cancelled and user_cancelled())
+
+        def log(line: str) -> None:
+            logger.write(line)
+            if on_progress:
+                on_progress(line)
+
+        log("START")
+        log(f"CollectionUrl: {opts.collection_url}")
+        log(f"Project:       {opts.project}")
+        log(f"OutRoot:       {paths.out_root}")
+        log(f"BundlesDir:    {paths.bundles_dir}")
+        log(f"ScratchDir:    {opts.scratch_dir or '-'}")
+        log(f"KeepMirrors:   {opts.keep_mirrors}")
+        log(f"CloneFilter:   {opts.clone_filter or '-'}")
+        log(f"ZipMode:       {opts.zip_mode.value}")
+        zlib_note = " (zlib-ng)" if _fast_zlib and opts.zip_compression == ZipCompression.DEFLATE else ""
+        log(f"ZipCompress:   {opts.zip_compression.value}{zlib_note}")
+        log(f"DelBundleZip:  {opts.delete_bundle_after_zip}")
+        log(f"SkipExisting:  {opts.skip_existing}")
+        log(f"VerifyBundles: {opts.verify_bundles}")
+        if opts.zip_mode == ZipMode.ZIP and opts.zip_compression not in _ZIP_COMPRESS_TYPES:
+            raise RuntimeError(f"ZIP compression '{opts.zip_compression.value}' is not supported by this Python (zstd needs 3.14+)")
+
+        log("Fetching repositories...")
+
+        repos = list_repos(opts.collection_url, opts.project, authorization, opts.api_version)
+        log(f"Found repos: {len(repos)}")
+
+        # from the full list: a filtered run picks the same names as a full one
+        file_names = repo_file_names(repos)
+        for r in repos:
+            if file_names[r] != safe_filename(r.name):
+                log(f"[{r.name}] Name collides with another repo after sanitizing, files use: {file_names[r]}")
+
+        only = (opts.only_substring or "").strip()
+        only_match = compile_only_filter(only)
+        if only_match:
+            repos = [r for r in repos if only_match(r.name)]
+            log(f"Filtered repos by only='{only}': {len(repos)}")
+
+        if opts.max_repos and opts.max_repos > 0:
+            repos = repos[: opts.max_repos]
+            log(f"Limited repos by max_repos={opts.max_repos}: {len(repos)}")
+
+        workers = opts.parallelism if opts.parallelism > 0 else auto_workers()
+        workers = max(1, min(workers, len(repos)))
+        # split the CPUs between concurrent bundle creates instead of each taking all of them
+        pack_threads = max(1, (os.cpu_count() or 1) // workers)
+        log(f"Parallelism:   {workers} (pack.threads={pack_threads})")
+
+        total = len(repos)
+
+        # one scan of bundles/ instead of a glob / stat per repo
+        existing_zips: Optional[Dict[str, List[Path]]] = None
+        existing_files: Optional[Set[str]] = None
+        if opts.skip_existing:
+            if opts.zip_mode == ZipMode.ZIP:
+                existing_zips = index_existing_zips(paths.bundles_dir)
+            else:
+                existing_files = {e.name for e in os.scandir(paths.bundles_dir)}
+
+        worker_local = threading.local()
+        worker_ids = itertools.count(1)
+
+        def worker_mirror_root() -> Path:
+            # kept mirrors stay flat, so the next run finds them whichever worker gets the repo
+            if opts.keep_mirrors:
+                return paths.mirrors_dir
+            # throwaway mirrors: one subtree per worker, concurrent clones do not share a directory
+            root = getattr(worker_local, "mirror_root", None)
+            if root is None:
+                root = paths.mirrors_dir / f"w{next(worker_ids)}"
+                ensure_dir(root)
+                worker_local.mirror_root = root
+            return root
+
+        def process(i: int, repo: RepoInfo) -> Tuple[bool, str, Optional[Path]]:
             if is_cancelled and is_cancelled():
                 raise CancelledError("Cancelled before processing next repo")
 
-            log(f"=== [{i}/{len(repos)}] Repo: {repo.name} ===")
+            log(f"=== [{i}/{total}] Repo: {repo.name} ===")
             try:
-                success, msg, artifact_path = archive_one_repo(
+                result = archive_one_repo(
                     repo=repo,
+                    repo_safe=file_names[repo],
                     paths=paths,
-                    log_path=paths.log_path,
-                    auth_basic_b64=auth_b64,
+                    run_id=run_id,
+                    logger=logger,
+                    auth_header=auth_header,
                     keep_mirrors=opts.keep_mirrors,
-                    zip_enabled=opts.zip_bundles,
+                    zip_mode=opts.zip_mode,
                     delete_bundle_after_zip=opts.delete_bundle_after_zip,
                     skip_existing=opts.skip_existing,
+                    verify_bundles=opts.verify_bundles,
+                    clone_filter=opts.clone_filter,
+                    zip_compression=opts.zip_compression,
+                    existing_zips=existing_zips,
+                    existing_files=existing_files,
+                    mirror_root=worker_mirror_root(),
+                    pack_threads=pack_threads,
                     is_cancelled=is_cancelled,
                     current_proc_setter=current_proc_setter,
                     on_progress=on_progress,
@@ -344,36 +664,75 @@ def run_archive(
             except CancelledError:
                 raise
             except Exception as e:
-                success, msg, artifact_path = False, f"EXCEPTION: {e}", None
-
-            if success:
-                ok_count += 1
-            else:
-                fail_count += 1
-
-            w.writerow([
-                repo.name,
-                repo.id,
-                repo.remote_url,
-                str(artifact_path) if artifact_path else "",
-                file_size_bytes(artifact_path),
-                "OK" if success else "FAIL",
-                msg,
-            ])
-            f.flush()
+                result = False, f"EXCEPTION: {e}", None
 
             if opts.sleep_sec > 0:
                 time.sleep(opts.sleep_sec)
-
-    log(f"DONE. OK={ok_count} FAIL={fail_count}")
-    log(f"CSV report: {paths.csv_path}")
-    log(f"README:     {paths.readme_path}")
-
-    if not opts.keep_mirrors:
-        try:
-            if paths.mirrors_dir.exists() and not any(paths.mirrors_dir.iterdir()):
-                paths.mirrors_dir.rmdir()
-        except Exception:
-            pass
+            return result
+
+        ok_count = 0
+        fail_count = 0
+
+        rows_since_flush = 0
+
+        # closing the file flushes the tail, also on cancel/error
+        with paths.csv_path.open("w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
+            csv.writer(f, delimiter=_CSV_DELIM).writerow(["repo_name", "repo_id", "remote_url", "artifact_path", "artifact_size_bytes", "status", "message"])
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive") as ex:
+                futures = {ex.submit(process, i, repo): repo for i, repo in enumerate(repos, start=1)}
+                try:
+                    # CSV rows are written only from this thread, in completion order
+                    for fut in as_completed(futures):
+                        repo = futures[fut]
+                        success, msg, artifact_path = fut.result()
+
+                        if success:
+                            ok_count += 1
+                        else:
+                            fail_count += 1
+                        log(f"[{repo.name}] {'OK' if success else 'FAIL'}: {msg}")
+
+                        f.write(_csv_row(
+                            repo.name,
+                            repo.id,
+                            repo.remote_url,
+                            str(artifact_path) if artifact_path else "",
+                            file_size_bytes(artifact_path),
+                            "OK" if success else "FAIL",
+                            msg,
+                        ))
+                        logger.flush()
+                        rows_since_flush += 1
+                        if rows_since_flush >= CSV_FLUSH_EVERY:
+                            f.flush()
+                            rows_since_flush = 0
+                except BaseException:
+                    # cancel, Ctrl+C (KeyboardInterrupt arrives in this thread) or an error:
+                    # drop the queued repos and stop the running ones instead of finishing them
+                    stop.set()
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    raise
+
+        log(f"DONE. OK={ok_count} FAIL={fail_count}")
+        log(f"CSV report: {paths.csv_path}")
+        log(f"README:     {paths.readme_path}")
+
+        if not opts.keep_mirrors:
+            try:
+                for d in paths.mirrors_dir.glob("w*"):
+                    if d.is_dir() and not any(d.iterdir()):
+                        d.rmdir()
+                if paths.mirrors_dir.exists() and not any(paths.mirrors_dir.iterdir()):
+                    paths.mirrors_dir.rmdir()
+            except Exception:
+                pass
+
+        if paths.stage_dir != paths.bundles_dir:
+            try:
+                if not any(paths.stage_dir.iterdir()):
+                    paths.stage_dir.rmdir()
+            except Exception:
+                pass
 
     return RunResult(ok=ok_count, fail=fail_count, log_path=paths.log_path, csv_path=paths.csv_path, readme_path=paths.readme_path)
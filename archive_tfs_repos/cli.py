@@ -3,7 +3,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from .models import AuthConfig, AuthMode, ArchiveOptions
+from .models import AuthConfig, AuthMode, ArchiveOptions, ZipMode, ZipCompression
 from .archiver import run_archive
 from .git_ops import CancelledError
 
@@ -21,18 +21,28 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--username", default="", help="Username (required for auth-mode=userpass)")
     ap.add_argument("--password", default="", help="Password (required for auth-mode=userpass)")
 
-    ap.add_argument("--keep-mirrors", action="store_true", help="Keep mirrors/ folder")
-    ap.add_argument("--only", default="", help="Process only repos containing substring (case-insensitive)")
+    ap.add_argument("--keep-mirrors", action="store_true", help="Keep mirrors/ folder, next run only fetches (default on)")
+    ap.add_argument("--no-keep-mirrors", action="store_true", help="Delete each mirror after its bundle is created")
+    ap.add_argument("--clone-filter", default="", help='Partial clone filter, e.g. "blob:none" (server must allow filters)')
+    ap.add_argument("--scratch-dir", default="", help='Fast scratch storage (e.g. RAM disk "/dev/shm/archive_tfs") for mirrors and bundles deleted after ZIP')
+    ap.add_argument("--only", default="", help='Process only repos containing substring (case-insensitive); several as "a,b,c"')
     ap.add_argument("--sleep", type=float, default=0.0, help="Sleep between repos (seconds)")
 
-    ap.add_argument("--zip-bundles", action="store_true", help="Pack each bundle into a ZIP (per repo)")
+    ap.add_argument("--zip-mode", choices=[m.value for m in ZipMode], default=None,
+                    help="Artifact per repo: none = .bundle + readmes, zip = ZIP (bundle + readmes), gz = .bundle.gz (default: none)")
+    ap.add_argument("--zip-bundles", action="store_true", help="Pack each bundle into a ZIP (per repo), same as --zip-mode zip")
+    ap.add_argument("--zip-compression", choices=[c.value for c in ZipCompression], default=ZipCompression.STORE.value,
+                    help="How the bundle is stored inside the ZIP (default: store, bundles are already compressed; zstd needs Python 3.14+)")
     ap.add_argument("--delete-bundle-after-zip", action="store_true", help="Delete .bundle after ZIP (default on if zip enabled)")
     ap.add_argument("--no-delete-bundle-after-zip", action="store_true", help="Do not delete .bundle after ZIP")
 
     ap.add_argument("--skip-existing", action="store_true", help="Skip if artifact exists (default on)")
     ap.add_argument("--no-skip-existing", action="store_true", help="Do not skip existing artifacts")
 
+    ap.add_argument("--verify-bundles", action="store_true", help="Run git bundle verify after creating each bundle")
+
     ap.add_argument("--max-repos", type=int, default=0, help="Limit number of repos (0 = all)")
+    ap.add_argument("--parallel", type=int, default=0, help="Number of repos archived concurrently (0 = auto: ~3/4 of CPUs, at least 4)")
 
     return ap
 
@@ -42,12 +52,16 @@ def main(argv: list[str] | None = None) -> int:
     args = ap.parse_args(argv)
 
     auth_mode = AuthMode(args.auth_mode)
-    auth = AuthConfig(
-        mode=auth_mode,
-        pat=args.pat if auth_mode == AuthMode.PAT else None,
-        username=args.username if auth_mode == AuthMode.USERPASS else None,
-        password=args.password if auth_mode == AuthMode.USERPASS else None,
-    )
+    try:
+        auth = AuthConfig(
+            mode=auth_mode,
+            pat=args.pat if auth_mode == AuthMode.PAT else None,
+            username=args.username if auth_mode == AuthMode.USERPASS else None,
+            password=args.password if auth_mode == AuthMode.USERPASS else None,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 2
 
     delete_bundle_after_zip = True
     if args.no_delete_bundle_after_zip:
@@ -55,6 +69,18 @@ def main(argv: list[str] | None = None) -> int:
     elif args.delete_bundle_after_zip:
         delete_bundle_after_zip = True
 
+    zip_mode = ZipMode.NONE
+    if args.zip_mode:
+        zip_mode = ZipMode(args.zip_mode)
+    elif args.zip_bundles:
+        zip_mode = ZipMode.ZIP
+
+    keep_mirrors = True
+    if args.no_keep_mirrors:
+        keep_mirrors = False
+    elif args.keep_mirrors:
+        keep_mirrors = True
+
     skip_existing = True
     if args.no_skip_existing:
         skip_existing = False
@@ -67,19 +93,24 @@ def main(argv: list[str] | None = None) -> int:
         out_root=Path(args.out_root),
         api_version=args.api_version,
 
-        keep_mirrors=bool(args.keep_mirrors),
+        keep_mirrors=bool(keep_mirrors),
+        clone_filter=(args.clone_filter or "").strip() or None,
+        scratch_dir=Path(args.scratch_dir) if args.scratch_dir else None,
         only_substring=args.only,
         sleep_sec=float(args.sleep),
 
-        zip_bundles=bool(args.zip_bundles),
+        zip_mode=zip_mode,
+        zip_compression=ZipCompression(args.zip_compression),
         delete_bundle_after_zip=bool(delete_bundle_after_zip),
         skip_existing=bool(skip_existing),
+        verify_bundles=bool(args.verify_bundles),
         max_repos=int(args.max_repos or 0),
+        parallelism=int(args.parallel or 0),
     )
 
     try:
         res = run_archive(auth=auth, opts=opts)
-    except CancelledError:
+    except (CancelledError, KeyboardInterrupt):
         print("CANCELLED")
         return 130
     except Exception as e:
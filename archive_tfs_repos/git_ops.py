@@ -1,33 +1,76 @@
 from __future__ import annotations
 
+import codecs
 import os
+import re
+import selectors
+import signal
 import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import BinaryIO, Dict, List, Optional, Callable, Union
 
-from .utils import append_log
+from .utils import LogWriter
+
+
+# Piece separators in git progress output
+_SEP_RE = re.compile(r"[\r\n]")
+
+# Read size for run_git_to_stream (payload data, not progress)
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Max read size for run_git (progress output)
+PROGRESS_CHUNK_SIZE = 1 << 16
+
+# How often run_git re-checks is_cancelled while git prints nothing (POSIX)
+CANCEL_POLL_SEC = 0.5
+
+# git gets its own process group on POSIX, so cancel can stop its helpers too
+# (git-remote-https, index-pack, pack-objects)
+_NEW_SESSION = os.name == "posix"
 
 
 class CancelledError(RuntimeError):
     pass
 
 
+def terminate_process(p: subprocess.Popen) -> None:
+    """Best-effort terminate of a git process started by run_git / run_git_to_stream."""
+    if p.poll() is not None:
+        return
+    try:
+        if _NEW_SESSION:
+            os.killpg(p.pid, signal.SIGTERM)
+        else:
+            p.terminate()
+    except Exception:
+        pass
+
+
+def _stdout_is_tty() -> bool:
+    try:
+        return sys.stdout is not None and sys.stdout.isatty()
+    except Exception:
+        return False
+
+
 def run_git(
     args: List[str],
-    cwd: Optional[Path],
-    log_path: Path,
+    cwd: Optional[Union[str, Path]],
+    logger: LogWriter,
     *,
     extra_env: Optional[Dict[str, str]] = None,
     is_cancelled: Optional[Callable[[], bool]] = None,
     current_proc_setter: Optional[Callable[[subprocess.Popen | None], None]] = None,
     on_output: Optional[Callable[[str], None]] = None,
+    capture_stdout: bool = True,
 ) -> int:
     """
     Git runner with REAL-TIME progress streaming (works with git clone --progress):
-    - Uses binary pipes + read1() to avoid buffering issues
+    - Uses buffered binary pipes + read1(): returns as soon as data is available
     - Handles both '\\n' and '\\r' progress updates
-    - stderr merged into stdout
+    - stderr merged into stdout; with capture_stdout=False stdout is discarded
+      and only stderr (progress/errors) is read
     """
 
     def mask_args(cmd: List[str]) -> str:
@@ -42,62 +85,72 @@ def run_git(
     if is_cancelled and is_cancelled():
         raise CancelledError("Cancelled before git start")
 
+    # raw git output goes to the console only for interactive CLI runs;
+    # with on_output (GUI) the parsed pieces are enough
+    mirror_stdout = on_output is None and _stdout_is_tty()
+
     env = os.environ.copy()
     env["GIT_TERMINAL_PROMPT"] = "0"
     if extra_env:
         env.update(extra_env)
 
     cmd_str = mask_args(args)
-    append_log(log_path, f"RUN: {cmd_str}")
+    logger.write(f"RUN: {cmd_str}")
     if on_output:
         on_output(f"RUN: {cmd_str}")
 
-    # IMPORTANT: text=False (binary), so we can use read1()
+    # IMPORTANT: text=False and buffered (bufsize=-1), so stdout is a BufferedReader with read1()
     p = subprocess.Popen(
         args,
-        cwd=str(cwd) if cwd else None,
+        cwd=os.fspath(cwd) if cwd is not None else None,
         env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.STDOUT if capture_stdout else subprocess.PIPE,
         text=False,
-        bufsize=0,
+        bufsize=-1,
+        start_new_session=_NEW_SESSION,
     )
 
     if current_proc_setter:
         current_proc_setter(p)
 
+    sel: Optional[selectors.BaseSelector] = None
     try:
-        assert p.stdout is not None
+        stream = p.stdout if capture_stdout else p.stderr
+        assert stream is not None
 
-        with log_path.open("ab") as lf:  # binary log write
-            buf = b""
+        # one decoder for the whole stream: keeps multi-byte chars split between chunks intact
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buf = ""
 
-            def emit_piece(piece_bytes: bytes) -> None:
-                if not on_output:
-                    return
-                try:
-                    s = piece_bytes.decode("utf-8", errors="replace")
-                except Exception:
-                    s = str(piece_bytes)
-                s = s.strip("\n")
-                # do not spam empty pieces
-                if s.strip():
-                    on_output(s)
-
-            while True:
-                if is_cancelled and is_cancelled():
-                    try:
-                        p.terminate()
-                    except Exception:
-                        pass
-                    raise CancelledError("Cancelled during git process")
-
-                # read1 returns as soon as ANY data is available (key for progress)
-                chunk = p.stdout.read1(4096)  # type: ignore[attr-defined]
-                if not chunk:
-                    break
-
-                # Write raw bytes to terminal + log file
+        # POSIX: wait for output with a timeout, so cancel is noticed even while git is silent
+        # (e.g. server-side pack preparation); Windows pipes cannot be selected, read blocks there
+        if _NEW_SESSION and is_cancelled:
+            sel = selectors.DefaultSelector()
+            sel.register(stream, selectors.EVENT_READ)
+
+        def emit_piece(s: str) -> None:
+            if not on_output:
+                return
+            # do not spam empty pieces
+            if s.strip():
+                on_output(s)
+
+        while True:
+            if is_cancelled and is_cancelled():
+                raise CancelledError("Cancelled during git process")
+
+            if sel is not None and not sel.select(CANCEL_POLL_SEC):
+                continue
+
+            # read1 returns as soon as ANY data is available (key for progress);
+            # it never leaves data in the buffer, so select on the fd stays accurate
+            chunk = stream.read1(PROGRESS_CHUNK_SIZE)  # type: ignore[attr-defined]
+            if not chunk:
+                break
+
+            # Write raw bytes to terminal + log file
+            if mirror_stdout:
                 try:
                     sys.stdout.buffer.write(chunk)
                     sys.stdout.buffer.flush()
@@ -106,43 +159,103 @@ def run_git(
                     sys.stdout.write(chunk.decode("utf-8", errors="replace"))
                     sys.stdout.flush()
 
-                lf.write(chunk)
-                lf.flush()
-
-                # Stream to GUI: split by '\r' or '\n'
-                buf += chunk
-                while True:
-                    npos = buf.find(b"\n")
-                    rpos = buf.find(b"\r")
-
-                    if npos == -1 and rpos == -1:
-                        # keep buffer under control
-                        if len(buf) > 8192:
-                            emit_piece(buf[-2048:])
-                            buf = b""
-                        break
-
-                    if npos == -1:
-                        cut = rpos
-                        sep = b"\r"
-                    elif rpos == -1:
-                        cut = npos
-                        sep = b"\n"
-                    else:
-                        cut = min(npos, rpos)
-                        sep = buf[cut : cut + 1]
-
-                    piece = buf[:cut]
-                    buf = buf[cut + 1 :]
-
-                    # For '\r' progress updates: emit immediately
-                    emit_piece(piece)
-
-            # flush remaining
-            if buf:
-                emit_piece(buf)
-
-        return p.wait()
+            logger.write_raw(chunk)
+
+            # Stream to GUI: split by '\r' or '\n' ('\r' progress updates are emitted immediately)
+            if on_output:
+                buf += decoder.decode(chunk)
+                last = 0
+                for m in _SEP_RE.finditer(buf):
+                    emit_piece(buf[last : m.start()])
+                    last = m.end()
+                buf = buf[last:]
+
+                # keep buffer under control
+                if len(buf) > 8192:
+                    emit_piece(buf[-2048:])
+                    buf = ""
+
+        # flush remaining
+        if on_output:
+            buf += decoder.decode(b"", final=True)
+        if buf:
+            emit_piece(buf)
+
+        rc = p.wait()
+        # killed by cancel (GUI terminate / interrupt): report the cancel, not a git failure
+        if rc != 0 and is_cancelled and is_cancelled():
+            raise CancelledError("Cancelled during git process")
+        return rc
+
+    except BaseException:
+        # cancel, Ctrl+C or an error while streaming: do not leave git running
+        terminate_process(p)
+        raise
+
+    finally:
+        if sel is not None:
+            sel.close()
+        if current_proc_setter:
+            current_proc_setter(None)
+
+
+def run_git_to_stream(
+    args: List[str],
+    cwd: Optional[Union[str, Path]],
+    logger: LogWriter,
+    sink: BinaryIO,
+    *,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+    current_proc_setter: Optional[Callable[[subprocess.Popen | None], None]] = None,
+) -> int:
+    """
+    Git runner for commands that write their payload to stdout
+    (e.g. `git bundle create - --all`):
+    - stdout is copied into `sink` in large chunks
+    - stderr goes straight to the log file
+    """
+    if is_cancelled and is_cancelled():
+        raise CancelledError("Cancelled before git start")
+
+    env = os.environ.copy()
+    env["GIT_TERMINAL_PROMPT"] = "0"
+
+    logger.write(f"RUN: {' '.join(args)}")
+
+    # stderr goes to the log file directly: flush our buffer first to keep order
+    logger.flush()
+    p = subprocess.Popen(
+        args,
+        cwd=os.fspath(cwd) if cwd is not None else None,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=logger.fileno(),
+        start_new_session=_NEW_SESSION,
+    )
+
+    if current_proc_setter:
+        current_proc_setter(p)
+
+    try:
+        assert p.stdout is not None
+        while True:
+            if is_cancelled and is_cancelled():
+                raise CancelledError("Cancelled during git process")
+
+            chunk = p.stdout.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            sink.write(chunk)
+
+        rc = p.wait()
+        # killed by cancel (GUI terminate / interrupt): report the cancel, not a git failure
+        if rc != 0 and is_cancelled and is_cancelled():
+            raise CancelledError("Cancelled during git process")
+        return rc
+
+    except BaseException:
+        terminate_process(p)
+        raise
 
     finally:
         if current_proc_setter:
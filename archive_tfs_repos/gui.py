@@ -1,15 +1,32 @@
 from __future__ import annotations
 
+import re
 import threading
-import queue
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 import subprocess
 
-from .models import AuthConfig, AuthMode, ArchiveOptions
+from .models import AuthConfig, AuthMode, ArchiveOptions, ZipMode
 from .archiver import run_archive
-from .git_ops import CancelledError
+from .git_ops import CancelledError, terminate_process
+
+
+# Log lines arriving within this window are inserted into the text widget at once
+LOG_FLUSH_MS = 20
+
+# Lines kept in the log widget (oldest are dropped); the run log file has everything
+LOG_MAX_LINES = 5000
+
+# Pending lines cap (only reached if Tk stalls); beyond it only essential lines are kept
+LOG_PENDING_MAX = 10_000
+
+# "[repo] Receiving objects:  23% (...)", "[repo] remote: Counting objects:  10% ...":
+# the key (repo + phase) identifies lines that supersede each other
+_PROGRESS_RE = re.compile(r"^((?:\[[^\]]*\] )?(?:remote: )?[A-Z][A-Za-z ]+):\s+\d+%")
+
+# per-repo results and run summary: never dropped
+_ESSENTIAL_RE = re.compile(r"^\[[^\]]*\] (?:OK|FAIL): |^(?:FINISHED|ERROR|CANCELLED|LOG|CSV|README)\b")
 
 
 class App(tk.Tk):
@@ -19,13 +36,21 @@ class App(tk.Tk):
         self.geometry("980x680")
         self.minsize(900, 620)
 
-        self._log_q: "queue.Queue[str]" = queue.Queue()
+        # lines from worker threads wait here until the next _flush_log on the Tk thread
+        self._log_lines: list[str] = []
+        # progress key -> index in _log_lines of its latest (not yet shown) line
+        self._log_progress: dict[str, int] = {}
+        self._log_lock = threading.Lock()
+        self._log_flush_pending = False
         self._worker: threading.Thread | None = None
         self._cancel_flag = threading.Event()
-        self._current_proc: subprocess.Popen | None = None
+        # running git process per worker thread (archiving is parallel)
+        self._current_procs: dict[int, subprocess.Popen] = {}
+        self._procs_lock = threading.Lock()
+        # auth mode the PAT/user/password entries are currently configured for
+        self._auth_fields_mode: str | None = None
 
         self._build_ui()
-        self.after(100, self._drain_log_queue)
 
     def _build_ui(self) -> None:
         root = ttk.Frame(self, padding=10)
@@ -57,6 +82,11 @@ class App(tk.Tk):
         self.var_api_version = tk.StringVar(value="6.0")
         ttk.Entry(frm_top, textvariable=self.var_api_version, width=10).grid(row=3, column=1, sticky="w", pady=2)
 
+        ttk.Label(frm_top, text="Scratch dir (RAM disk):").grid(row=4, column=0, sticky="w", padx=(0, 8), pady=2)
+        self.var_scratch = tk.StringVar(value="")
+        ttk.Entry(frm_top, textvariable=self.var_scratch).grid(row=4, column=1, sticky="ew", pady=2)
+        ttk.Button(frm_top, text="Browse...", command=self._browse_scratch).grid(row=4, column=2, sticky="ew", padx=(8, 0), pady=2)
+
         # ---- Auth ----
         frm_auth = ttk.LabelFrame(root, text="Auth", padding=10)
         frm_auth.grid(row=1, column=0, sticky="ew", pady=(10, 0))
@@ -92,27 +122,43 @@ class App(tk.Tk):
 
         row0 = ttk.Frame(frm_opt)
         row0.grid(row=0, column=0, sticky="ew")
-        for i in range(8):
+        for i in range(11):
             row0.columnconfigure(i, weight=0)
-        row0.columnconfigure(7, weight=1)
+        row0.columnconfigure(10, weight=1)
 
-        self.var_zip = tk.BooleanVar(value=True)
+        self.var_zip_mode = tk.StringVar(value=ZipMode.ZIP.value)
         self.var_del_bundle = tk.BooleanVar(value=True)
-        self.var_keep_mirrors = tk.BooleanVar(value=False)
+        self.var_keep_mirrors = tk.BooleanVar(value=True)
         self.var_skip_existing = tk.BooleanVar(value=True)
-
-        ttk.Checkbutton(row0, text="ZIP bundles", variable=self.var_zip).grid(row=0, column=0, sticky="w", padx=(0, 10))
+        self.var_verify = tk.BooleanVar(value=False)
+
+        frm_zip = ttk.Frame(row0)
+        frm_zip.grid(row=0, column=0, sticky="w", padx=(0, 10))
+        ttk.Label(frm_zip, text="Pack:").pack(side="left")
+        ttk.Combobox(
+            frm_zip,
+            textvariable=self.var_zip_mode,
+            values=[m.value for m in ZipMode],
+            state="readonly",
+            width=6,
+        ).pack(side="left", padx=(6, 0))
         ttk.Checkbutton(row0, text="Delete .bundle after ZIP", variable=self.var_del_bundle).grid(row=0, column=1, sticky="w", padx=(0, 10))
         ttk.Checkbutton(row0, text="Keep mirrors/", variable=self.var_keep_mirrors).grid(row=0, column=2, sticky="w", padx=(0, 10))
         ttk.Checkbutton(row0, text="Skip existing", variable=self.var_skip_existing).grid(row=0, column=3, sticky="w", padx=(0, 10))
 
-        ttk.Label(row0, text="Only:").grid(row=0, column=4, sticky="e")
+        ttk.Checkbutton(row0, text="Verify bundles", variable=self.var_verify).grid(row=0, column=4, sticky="w", padx=(0, 10))
+
+        ttk.Label(row0, text="Only:").grid(row=0, column=5, sticky="e")
         self.var_only = tk.StringVar(value="")
-        ttk.Entry(row0, textvariable=self.var_only, width=20).grid(row=0, column=5, sticky="w", padx=(6, 10))
+        ttk.Entry(row0, textvariable=self.var_only, width=20).grid(row=0, column=6, sticky="w", padx=(6, 10))
 
-        ttk.Label(row0, text="Max repos:").grid(row=0, column=6, sticky="e")
+        ttk.Label(row0, text="Max repos:").grid(row=0, column=7, sticky="e")
         self.var_max = tk.StringVar(value="0")
-        ttk.Entry(row0, textvariable=self.var_max, width=8).grid(row=0, column=7, sticky="w", padx=(6, 0))
+        ttk.Entry(row0, textvariable=self.var_max, width=8).grid(row=0, column=8, sticky="w", padx=(6, 10))
+
+        ttk.Label(row0, text="Workers:").grid(row=0, column=9, sticky="e")
+        self.var_workers = tk.StringVar(value="0")
+        ttk.Entry(row0, textvariable=self.var_workers, width=6).grid(row=0, column=10, sticky="w", padx=(6, 0))
 
         row1 = ttk.Frame(frm_opt)
         row1.grid(row=1, column=0, sticky="nsew", pady=(10, 0))
@@ -143,32 +189,66 @@ class App(tk.Tk):
         if p:
             self.var_out_root.set(p)
 
+    def _browse_scratch(self) -> None:
+        p = filedialog.askdirectory(title="Select scratch folder (RAM disk)")
+        if p:
+            self.var_scratch.set(p)
+
     def _sync_auth_fields(self) -> None:
         mode = self.var_auth_mode.get()
-        if mode == "pat":
-            self.ent_pat.configure(state="normal")
-            self.ent_user.configure(state="disabled")
-            self.ent_pass.configure(state="disabled")
-        else:
-            self.ent_pat.configure(state="disabled")
-            self.ent_user.configure(state="normal")
-            self.ent_pass.configure(state="normal")
+        # clicking the already selected radio button: nothing to reconfigure
+        if mode == self._auth_fields_mode:
+            return
+        self._auth_fields_mode = mode
+        pat_state, userpass_state = ("normal", "disabled") if mode == "pat" else ("disabled", "normal")
+        self.ent_pat.configure(state=pat_state)
+        self.ent_user.configure(state=userpass_state)
+        self.ent_pass.configure(state=userpass_state)
 
     def _log(self, line: str) -> None:
-        self._log_q.put(line)
-
-    def _drain_log_queue(self) -> None:
-        try:
-            while True:
-                line = self._log_q.get_nowait()
-                self.txt_log.insert("end", f"{line}\n")
-                self.txt_log.see("end")
-        except queue.Empty:
-            pass
-        self.after(100, self._drain_log_queue)
+        # called from any thread; only the first line of a burst schedules a flush,
+        # so Tk is not woken up while nothing is logged
+        m = _PROGRESS_RE.match(line)
+        key = m.group(1) if m else None
+        with self._log_lock:
+            if key is not None:
+                idx = self._log_progress.get(key)
+                if idx is not None:
+                    # newer percentage of the same phase: replace the pending line, do not queue
+                    self._log_lines[idx] = line
+                    return
+            if len(self._log_lines) >= LOG_PENDING_MAX and not _ESSENTIAL_RE.match(line):
+                return
+            if key is not None:
+                self._log_progress[key] = len(self._log_lines)
+            self._log_lines.append(line)
+            if self._log_flush_pending:
+                return
+            self._log_flush_pending = True
+        # Tcl marshals calls from other threads to the Tk thread
+        self.after(LOG_FLUSH_MS, self._flush_log)
+
+    def _flush_log(self) -> None:
+        with self._log_lock:
+            lines = self._log_lines
+            self._log_lines = []
+            self._log_progress.clear()
+            self._log_flush_pending = False
+        if lines:
+            self.txt_log.insert("end", "\n".join(lines) + "\n")
+            # every logged line ends with "\n" and Text adds one more: lines = line("end") - 2
+            excess = int(self.txt_log.index("end").split(".")[0]) - 2 - LOG_MAX_LINES
+            if excess > 0:
+                self.txt_log.delete("1.0", f"{excess + 1}.0")
+            self.txt_log.see("end")
 
     def _set_current_proc(self, p: subprocess.Popen | None) -> None:
-        self._current_proc = p
+        tid = threading.get_ident()
+        with self._procs_lock:
+            if p is None:
+                self._current_procs.pop(tid, None)
+            else:
+                self._current_procs[tid] = p
 
     def _start(self) -> None:
         if self._worker and self._worker.is_alive():
@@ -216,13 +296,11 @@ class App(tk.Tk):
         if not (self._worker and self._worker.is_alive()):
             return
         self._cancel_flag.set()
-        # best-effort terminate current git process (if any)
-        p = self._current_proc
-        if p:
-            try:
-                p.terminate()
-            except Exception:
-                pass
+        # best-effort terminate running git processes (if any)
+        with self._procs_lock:
+            procs = list(self._current_procs.values())
+        for p in procs:
+            terminate_process(p)
         self._log("Cancel requested...")
 
     def _on_finish(self) -> None:
@@ -246,6 +324,8 @@ class App(tk.Tk):
     def _build_opts(self) -> ArchiveOptions:
         out_root = Path(self.var_out_root.get()).expanduser()
         max_repos = int(self.var_max.get() or "0")
+        scratch = (self.var_scratch.get() or "").strip()
+        workers = int(self.var_workers.get() or "0")
 
         return ArchiveOptions(
             collection_url=(self.var_collection.get() or "").strip(),
@@ -254,13 +334,16 @@ class App(tk.Tk):
             api_version=(self.var_api_version.get() or "6.0").strip(),
 
             keep_mirrors=bool(self.var_keep_mirrors.get()),
+            scratch_dir=Path(scratch).expanduser() if scratch else None,
             only_substring=(self.var_only.get() or "").strip(),
             sleep_sec=0.0,
 
-            zip_bundles=bool(self.var_zip.get()),
+            zip_mode=ZipMode(self.var_zip_mode.get()),
             delete_bundle_after_zip=bool(self.var_del_bundle.get()),
             skip_existing=bool(self.var_skip_existing.get()),
+            verify_bundles=bool(self.var_verify.get()),
             max_repos=max_repos,
+            parallelism=workers,
         )
 
 
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
+from .utils import b64_basic, b64_basic_pat
+
 
 @dataclass(frozen=True)
 class RepoInfo:
@@ -12,6 +16,11 @@ class RepoInfo:
     remote_url: str
     id: str
 
+    @cached_property
+    def digest(self) -> str:
+        """Short stable hash of (id, remote_url): tells apart repos whose names sanitize to the same file name."""
+        return hashlib.blake2b(f"{self.id}\0{self.remote_url}".encode("utf-8"), digest_size=8).hexdigest()
+
 
 class AuthMode(str, Enum):
     PAT = "pat"
@@ -25,6 +34,20 @@ class AuthConfig:
     username: Optional[str] = None
     password: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        # frozen: check once at construction and keep the derived header
+        self.validate()
+        if self.mode == AuthMode.PAT:
+            header = f"Basic {b64_basic_pat(self.pat or '')}"
+        else:
+            header = f"Basic {b64_basic(self.username or '', self.password or '')}"
+        object.__setattr__(self, "_auth_header", header)
+
+    @property
+    def auth_header(self) -> str:
+        """Authorization header value ("Basic ..."), for REST calls and git http.extraHeader."""
+        return self._auth_header  # type: ignore[attr-defined]
+
     def validate(self) -> None:
         if self.mode == AuthMode.PAT:
             if not self.pat:
@@ -36,6 +59,18 @@ class AuthConfig:
             raise ValueError(f"Unknown auth mode: {self.mode}")
 
 
+class ZipMode(str, Enum):
+    NONE = "none"  # <repo>.bundle + restore readmes next to it
+    ZIP = "zip"    # <repo>_<ts>.zip with bundle + restore readmes
+    GZ = "gz"      # <repo>.bundle.gz streamed from git, bundle never hits the disk
+
+
+class ZipCompression(str, Enum):
+    STORE = "store"      # bundle member as is (pack data is already zlib-compressed)
+    DEFLATE = "deflate"  # uses zlib-ng when installed
+    ZSTD = "zstd"        # Zstandard member, needs Python 3.14+ (zipfile.ZIP_ZSTANDARD)
+
+
 @dataclass(frozen=True)
 class ArchiveOptions:
     collection_url: str
@@ -43,14 +78,19 @@ class ArchiveOptions:
     out_root: Path
     api_version: str = "6.0"
 
-    keep_mirrors: bool = False
+    keep_mirrors: bool = True  # next run fetches into the mirror instead of cloning again
+    clone_filter: Optional[str] = None  # e.g. "blob:none" (metadata-only archive)
+    scratch_dir: Optional[Path] = None  # e.g. a RAM disk: mirrors + bundles that are zipped and deleted
     only_substring: str = ""
     sleep_sec: float = 0.0
 
-    zip_bundles: bool = False
+    zip_mode: ZipMode = ZipMode.NONE
+    zip_compression: ZipCompression = ZipCompression.STORE
     delete_bundle_after_zip: bool = True
     skip_existing: bool = True
+    verify_bundles: bool = False
     max_repos: int = 0
+    parallelism: int = 0
 
 
 @dataclass(frozen=True)
@@ -64,3 +104,6 @@ class RunPaths:
     log_path: Path
     csv_path: Path
     readme_path: Path
+
+    # bundles that only live until they are zipped (== bundles_dir without scratch_dir)
+    stage_dir: Path
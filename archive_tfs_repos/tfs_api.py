@@ -1,26 +1,131 @@
 from __future__ import annotations
 
+import gzip
+import http.client
 import json
+import ssl
+import threading
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from .models import RepoInfo
 
+try:  # optional faster JSON parser: pip install orjson
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
 
-def http_get_json(url: str, auth_basic_b64: str, timeout: int = 60) -> Dict[str, Any]:
-    req = urllib.request.Request(
-        url,
-        method="GET",
-        headers={
-            "Accept": "application/json",
-            "Authorization": f"Basic {auth_basic_b64}",
-        },
-    )
+
+# Keep-alive connections per (scheme, host, port), reused across requests
+POOL_MAXSIZE = 8
+
+# Retries for connection errors and these statuses, with exponential backoff
+RETRY_TOTAL = 3
+RETRY_BACKOFF_SEC = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+_PoolKey = Tuple[str, str, int]
+
+_pool: Dict[_PoolKey, List[http.client.HTTPConnection]] = {}
+_pool_lock = threading.Lock()
+_ssl_context = ssl.create_default_context()
+
+
+def _pool_key(url: str) -> _PoolKey:
+    u = urllib.parse.urlsplit(url)
+    scheme = u.scheme.lower()
+    if scheme not in ("http", "https"):
+        raise RuntimeError(f"Unsupported URL scheme: {url}")
+    return scheme, u.hostname or "", u.port or (443 if scheme == "https" else 80)
+
+
+def _uses_proxy(url: str) -> bool:
+    u = urllib.parse.urlsplit(url)
+    return u.scheme.lower() in urllib.request.getproxies() and not urllib.request.proxy_bypass(u.hostname or "")
+
+
+def _take_conn(key: _PoolKey, timeout: int) -> Tuple[http.client.HTTPConnection, bool]:
+    """Pooled connection if there is one (reused=True), else a new one."""
+    with _pool_lock:
+        conns = _pool.get(key)
+        if conns:
+            conn = conns.pop()
+            conn.timeout = timeout
+            return conn, True
+    scheme, host, port = key
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, port, timeout=timeout, context=_ssl_context), False
+    return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+
+def _give_back(key: _PoolKey, conn: http.client.HTTPConnection) -> None:
+    with _pool_lock:
+        conns = _pool.setdefault(key, [])
+        if len(conns) < POOL_MAXSIZE:
+            conns.append(conn)
+            return
+    conn.close()
+
+
+def _pooled_get(url: str, headers: Dict[str, str], timeout: int) -> Tuple[int, http.client.HTTPMessage, bytes]:
+    key = _pool_key(url)
+    u = urllib.parse.urlsplit(url)
+    target = urllib.parse.urlunsplit(("", "", u.path or "/", u.query, ""))
+
+    while True:
+        conn, reused = _take_conn(key, timeout)
+        try:
+            conn.request("GET", target, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            # the server closed an idle keep-alive connection: retry once on a fresh one
+            if reused:
+                continue
+            raise
+        except BaseException:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            _give_back(key, conn)
+
+        if resp.getheader("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return resp.status, resp.msg, body
+
+
+def _parse_json(body: bytes, url: str) -> Dict[str, Any]:
+    if _orjson is not None:
+        try:
+            return _orjson.loads(body)
+        except _orjson.JSONDecodeError:
+            pass  # non-UTF-8 or broken body: lenient path below, same errors as without orjson
+    # json.loads takes bytes (UTF-8/16/32 detected): no decoded copy of the whole body
+    try:
+        try:
+            return json.loads(body)
+        except UnicodeDecodeError:
+            return json.loads(body.decode("utf-8", errors="replace"))
+    except ValueError as e:
+        raise RuntimeError(f"Invalid JSON from {url}: {e}\n{body[:512]!r}") from e
+
+
+def _urlopen_json(url: str, headers: Dict[str, str], timeout: int) -> Dict[str, Any]:
+    # urllib path: proxies from the environment / system settings
+    req = urllib.request.Request(url, method="GET", headers=headers)
     try:
         with urllib.request.urlopen(req, timeout=timeout) as resp:
-            data = resp.read().decode("utf-8", errors="replace")
-            return json.loads(data)
+            return _parse_json(resp.read(), url)
     except urllib.error.HTTPError as e:
         body = e.read().decode("utf-8", errors="replace") if hasattr(e, "read") else ""
         raise RuntimeError(f"HTTP {e.code} for {url}\n{body}") from e
@@ -28,10 +133,54 @@ def http_get_json(url: str, auth_basic_b64: str, timeout: int = 60) -> Dict[str,
         raise RuntimeError(f"URL error for {url}: {e}") from e
 
 
-def list_repos(collection_url: str, project: str, auth_b64: str, api_version: str) -> List[RepoInfo]:
+def http_get_json(url: str, authorization: str, timeout: int = 60) -> Dict[str, Any]:
+    """
+    GET a JSON document over pooled keep-alive connections:
+    - gzip responses, redirects (Authorization only kept on the same host)
+    - retries connection errors and 429/5xx with exponential backoff
+    - falls back to urllib when a proxy is configured for the URL
+    """
+    headers = {
+        "Accept": "application/json",
+        "Authorization": authorization,
+    }
+    if _uses_proxy(url):
+        return _urlopen_json(url, headers, timeout)
+
+    headers["Accept-Encoding"] = "gzip"
+    origin = _pool_key(url)
+    redirects = 0
+    attempt = 0
+    while True:
+        try:
+            status, resp_headers, body = _pooled_get(url, headers, timeout)
+        except (OSError, http.client.HTTPException) as e:
+            if attempt >= RETRY_TOTAL:
+                raise RuntimeError(f"URL error for {url}: {e}") from e
+        else:
+            location = resp_headers.get("Location")
+            if status in _REDIRECT_STATUSES and location and redirects < MAX_REDIRECTS:
+                redirects += 1
+                url = urllib.parse.urljoin(url, location)
+                if _pool_key(url) != origin:
+                    headers.pop("Authorization", None)
+                continue
+
+            if status in RETRY_STATUSES and attempt < RETRY_TOTAL:
+                pass
+            elif status >= 400:
+                raise RuntimeError(f"HTTP {status} for {url}\n{body.decode('utf-8', errors='replace')}")
+            else:
+                return _parse_json(body, url)
+
+        time.sleep(RETRY_BACKOFF_SEC * (2 ** attempt))
+        attempt += 1
+
+
+def list_repos(collection_url: str, project: str, authorization: str, api_version: str) -> List[RepoInfo]:
     base = collection_url.rstrip("/")
     url = f"{base}/{project}/_apis/git/repositories?api-version={api_version}"
-    data = http_get_json(url, auth_b64)
+    data = http_get_json(url, authorization)
 
     items = data.get("value", [])
     repos: List[RepoInfo] = []
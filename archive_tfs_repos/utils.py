@@ -2,40 +2,117 @@ from __future__ import annotations
 
 import base64
 import datetime as dt
+import functools
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
 from pathlib import Path
 
 
+# (second, formatted) of the last now_str() call; replaced as a whole, so safe across threads
+_now_cache: tuple[int, str] = (0, "")
+
+
 def now_str() -> str:
-    return dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global _now_cache
+    t = int(time.time())
+    cached = _now_cache
+    if cached[0] != t:
+        cached = (t, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t)))
+        _now_cache = cached
+    return cached[1]
 
 
 def ts_compact() -> str:
     return dt.datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
+class _SafeCharTable(dict):
+    """str.translate table for safe_filename: filled on first sight of each code point."""
+
+    def __missing__(self, c: int) -> int:
+        ch = chr(c)
+        # str.isalnum keeps non-ASCII letters/digits (e.g. Cyrillic names) as they are
+        v = c if ch.isalnum() or ch in "-_." else ord("_")
+        self[c] = v
+        return v
+
+
+_SAFE_TABLE = _SafeCharTable()
+
+# ASCII fast path (the usual case): one bytes.translate in C
+_SAFE_ASCII = bytes(_SAFE_TABLE[c] for c in range(0x80)) + b"_" * 0x80
+
+
+@functools.lru_cache(maxsize=4096)
 def safe_filename(name: str) -> str:
-    repl = []
-    for ch in name:
-        if ch.isalnum() or ch in ("-", "_", "."):
-            repl.append(ch)
-        else:
-            repl.append("_")
-    return "".join(repl).strip("_") or "repo"
+    if name.isascii():
+        safe = name.encode("ascii").translate(_SAFE_ASCII).decode("ascii")
+    else:
+        safe = name.translate(_SAFE_TABLE)
+    return safe.strip("_") or "repo"
 
 
 def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
+def remove_tree(p: Path) -> None:
+    # Mirrors hold thousands of small object files: on POSIX let rm walk them in C
+    if os.name == "posix":
+        try:
+            subprocess.run(["rm", "-rf", "--", str(p)], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return
+        except OSError:
+            pass
+    shutil.rmtree(p, ignore_errors=True)
+
+
 def write_text(p: Path, s: str) -> None:
     p.write_text(s, encoding="utf-8")
 
 
-def append_log(log_path: Path, line: str) -> None:
-    msg = f"[{now_str()}] {line}"
-    print(msg)
-    with log_path.open("a", encoding="utf-8") as f:
-        f.write(msg + "\n")
+class LogWriter:
+    """Run log kept open (buffered) for the whole run; shared by worker threads."""
+
+    def __init__(self, log_path: Path, buffering: int = 1 << 16) -> None:
+        self.path = log_path
+        self._f = log_path.open("ab", buffering=buffering)
+        self._lock = threading.Lock()
+
+    def write(self, line: str) -> None:
+        msg = f"[{now_str()}] {line}\n"
+        # one write per line: lines from parallel workers do not interleave on the console
+        out = sys.stdout
+        if out is not None:
+            out.write(msg)
+        data = msg.encode("utf-8")
+        with self._lock:
+            self._f.write(data)
+
+    def write_raw(self, data: bytes) -> None:
+        with self._lock:
+            self._f.write(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._f.flush()
+
+    def fileno(self) -> int:
+        return self._f.fileno()
+
+    def close(self) -> None:
+        with self._lock:
+            self._f.close()
+
+    def __enter__(self) -> "LogWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
 
 def b64_basic(user: str, password: str) -> str:
@@ -50,7 +127,10 @@ def b64_basic_pat(pat: str) -> str:
 
 
 def file_size_bytes(p: Path | None) -> int:
+    if p is None:
+        return 0
+    # one stat instead of exists() + stat()
     try:
-        return p.stat().st_size if p and p.exists() else 0
-    except Exception:
+        return os.stat(p).st_size
+    except (FileNotFoundError, PermissionError):
         return 0